@@ -1,7 +1,9 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+import numpy as np
 import openpyxl
+import math
 import os
 
 logo_path = os.path.join(os.path.dirname(__file__), "assets", "LOgo.png")
@@ -81,33 +83,230 @@ def format_number(value):
     except (ValueError, TypeError):
         return "-"
 
+# Penyimpanan numerik ringkas
+# Nilai investasi disimpan sebagai integer fixed-point (nilai * skala) bila tanpa kehilangan
+# presisi dan jumlah absolut seluruh kolom muat di int64. Hanya pada kasus ini penjumlahan
+# dijamin eksak, karena setiap subset juga muat di int64. Jika tidak (misalnya file contoh,
+# yang totalnya sekitar 4,6e19), kolom tetap float dan setiap total maupun agregasi per
+# kelompok memakai math.fsum (dibulatkan sekali, bukan eksak). Skala dicatat di df.attrs['skala'].
+MAX_DESIMAL_FIXED_POINT = 4
+# math.fsum dibulatkan dengan benar, sehingga hasil < 2**63 berarti jumlah sebenarnya <= int64 max
+BATAS_INT64 = 2.0 ** 63
+
+def compact_money(values):
+    arr = values.to_numpy(dtype='float64')
+    for desimal in range(MAX_DESIMAL_FIXED_POINT + 1):
+        skala = 10 ** desimal
+        scaled = np.round(arr * skala)
+        if math.fsum(np.abs(scaled)) >= BATAS_INT64:
+            break
+        if np.array_equal(scaled / skala, arr):
+            return pd.Series(scaled.astype('int64'), index=values.index, name=values.name), skala
+    if np.array_equal(arr.astype('float32').astype('float64'), arr):
+        return values.astype('float32'), None
+    return values.astype('float64'), None
+
+# Skala fixed-point sebuah kolom (None untuk kolom float)
+def column_scale(df, column):
+    return df.attrs.get('skala', {}).get(column)
+
+# Total kolom dalam satuan asli dikali `unit`; satuan diterapkan pada agregat, bukan per baris
+def scaled_sum(df, column, unit=1):
+    if column not in df.columns:
+        return 0
+    skala = column_scale(df, column)
+    if pd.api.types.is_integer_dtype(df[column]):
+        total = int(df[column].sum()) * unit
+        return total / skala if skala else total
+    return math.fsum(df[column].to_numpy(dtype='float64')) * unit
+
+# Jumlah per kelompok: kolom integer dijumlah eksak, kolom float memakai math.fsum
+def group_sum(df, grouped, column):
+    if pd.api.types.is_integer_dtype(df[column]):
+        return grouped[column].sum()
+    return grouped[column].agg(math.fsum)
+
+# Konversi hasil agregasi (atau kolom) ke satuan asli dikali `unit`
+def to_unit(df, values, unit=1):
+    skala = column_scale(df, values.name) or 1
+    return values.astype('float64') * unit / skala
+
+# Ringkasan jumlah proyek, investasi (USD), dan tenaga kerja per kelompok
+def summarize_groups(df, grouped):
+    summary = grouped.size().to_frame('jumlah_proyek')
+    if 'investasi_us_ribu' in df.columns:
+        summary['total_investasi_usd'] = to_unit(df, group_sum(df, grouped, 'investasi_us_ribu'), 1_000)
+    if 'tki' in df.columns:
+        summary['total_tki'] = group_sum(df, grouped, 'tki')
+    return summary
+
+# Rincian bertingkat
+# Setiap simpul hanya diagregasi saat dibuka, dan hasilnya di-cache per status filter.
+DRILLDOWN_HIERARCHIES = {
+    'Wilayah': ['pulau', 'provinsi', 'kabupaten_kota'],
+    'Sektor': ['sektor_utama', 'nama_sektor', 'deskripsi_kbli_2digit']
+}
+DRILLDOWN_LABELS = {
+    'pulau': 'Pulau',
+    'provinsi': 'Provinsi',
+    'kabupaten_kota': 'Kabupaten/Kota',
+    'sektor_utama': 'Sektor Utama',
+    'nama_sektor': 'Sektor Usaha',
+    'deskripsi_kbli_2digit': 'KBLI 2 Digit'
+}
+UNKNOWN_LABEL = "(Tidak tercatat)"
+
+# Agregasi anak dari simpul `path`. Posisi baris setiap anak ikut disimpan sehingga
+# membuka simpul yang lebih dalam hanya membaca subset simpul induknya.
+# `_df` tidak di-hash; identitas data dan filter diwakili oleh `filter_key`.
+@st.cache_data(show_spinner=False, max_entries=256)
+def drilldown_node(_df, filter_key, hierarchy, path):
+    if path:
+        _, parent_positions = drilldown_node(_df, filter_key, hierarchy, path[:-1])
+        positions = parent_positions[path[-1]]
+        subset = _df.iloc[positions]
+    else:
+        positions = None
+        subset = _df
+
+    column = DRILLDOWN_HIERARCHIES[hierarchy][len(path)]
+    grouped = subset.groupby(subset[column].fillna(UNKNOWN_LABEL))
+    summary = summarize_groups(subset, grouped)
+    child_positions = {
+        child: (rows if positions is None else positions[rows])
+        for child, rows in grouped.indices.items()
+    }
+    return summary, child_positions
+
+# Skema data realisasi investasi
+# 'teks' = kategori, 'angka' = nilai desimal, 'bulat' = bilangan bulat (hitungan orang)
+REALISASI_SCHEMA = {
+    'periode': 'teks',
+    'status_penanaman_modal': 'teks',
+    'regional': 'teks',
+    'negara': 'teks',
+    'sektor_utama': 'teks',
+    'nama_sektor': 'teks',
+    'deskripsi_kbli_2digit': 'teks',
+    'provinsi': 'teks',
+    'kabupaten_kota': 'teks',
+    'jawa_luar_jawa': 'teks',
+    'pulau': 'teks',
+    'investasi_rp_juta': 'angka',
+    'investasi_us_ribu': 'angka',
+    'tki': 'bulat'
+}
+# Kolom yang dipakai langsung oleh filter sidebar; tanpa kolom ini dashboard tidak bisa berjalan
+REQUIRED_COLUMNS = ['provinsi', 'kabupaten_kota', 'nama_sektor', 'status_penanaman_modal']
+STATUS_PENANAMAN_MODAL = ['PMA', 'PMDN']
+REPORT_COLUMNS = ['baris', 'kolom', 'nilai', 'alasan']
+
+# Entri teks sebuah kolom dalam bentuk ter-strip; entri bukan teks menjadi NA.
+# Aksesor .str menangani kolom campuran tanpa loop Python per sel.
+def text_entries(values):
+    try:
+        return values.str.strip()
+    except AttributeError:
+        return pd.Series(pd.NA, index=values.index, dtype=object)
+
+# Ubah kolom angka secara vektor. Entri teks selalu memakai format Indonesia (titik ribuan,
+# koma desimal), entri angka dari Excel dibaca apa adanya.
+# Mengembalikan nilai float (kosong/"-" menjadi 0) dan mask baris yang gagal dikonversi.
+def parse_numbers(values):
+    text = text_entries(values)
+    is_text = text.notna()
+    parsed = pd.to_numeric(values.where(~is_text), errors='coerce').astype('float64')
+    if is_text.any():
+        normalized = text[is_text].str.replace('.', '', regex=False).str.replace(',', '.', regex=False)
+        parsed[is_text] = pd.to_numeric(normalized, errors='coerce').astype('float64')
+
+    blank = values.isna() | text.isin(['', '-'])
+    failed = parsed.isna() & ~blank
+    return parsed.fillna(0.0), failed
+
+# Kumpulkan baris bermasalah untuk satu pemeriksaan ke dalam format laporan
+def rejection_rows(df, column, mask, reason):
+    rows = df.loc[mask, column]
+    return pd.DataFrame({
+        'baris': rows.index + 2,  # nomor baris Excel (baris 1 = header)
+        'kolom': column,
+        'nilai': rows.astype('string'),
+        'alasan': reason
+    })
+
+# Validasi seluruh kolom sekaligus; baris yang ditolak dibuang dan dicatat di laporan
+def validate_realisasi(df):
+    report = []
+    rejected = pd.Series(False, index=df.index)
+
+    for column, kind in REALISASI_SCHEMA.items():
+        if column not in df.columns:
+            continue
+
+        values = df[column]
+        parsed = None
+        if kind == 'teks':
+            if column == 'status_penanaman_modal':
+                text = text_entries(values)
+                values = text.where(text.notna(), values)
+                df[column] = values
+                invalid = ~values.isin(STATUS_PENANAMAN_MODAL)
+                reason = f"status harus salah satu dari {', '.join(STATUS_PENANAMAN_MODAL)}"
+            else:
+                invalid = values.notna() & pd.to_numeric(values, errors='coerce').notna()
+                reason = "berisi angka, seharusnya teks"
+        else:
+            parsed, invalid = parse_numbers(values)
+            reason = "tidak dapat dikonversi menjadi angka"
+            if kind == 'bulat':
+                fractional = ~invalid & (parsed % 1 != 0)
+                if fractional.any():
+                    report.append(rejection_rows(df, column, fractional, "bukan bilangan bulat"))
+                    rejected |= fractional
+
+        if invalid.any():
+            report.append(rejection_rows(df, column, invalid, reason))
+            rejected |= invalid
+        if parsed is not None:
+            df[column] = parsed
+
+    report = pd.concat(report, ignore_index=True) if report else pd.DataFrame(columns=REPORT_COLUMNS)
+    report['baris'] = report['baris'].astype('Int64')
+    if rejected.any():
+        df = df[~rejected].copy()
+    return df, report
+
 # Load data
 @st.cache_data
 def load_data(uploaded_file):
     try:
-        df = pd.read_excel(uploaded_file)
-
-        def clean_number(x):
-            if pd.isna(x) or x in ["", "-"]:
-                return 0.0
-            if isinstance(x, str):
-                x = x.replace('.', '').replace(',', '.')
-            try:
-                return float(x)
-            except:
-                return 0.0
-
-        if 'investasi_rp_juta' in df.columns:
-            df['investasi_rp_juta'] = df['investasi_rp_juta'].apply(clean_number)
-        if 'investasi_us_ribu' in df.columns:
-            df['investasi_us_ribu'] = df['investasi_us_ribu'].apply(clean_number)
+        # Periksa header terlebih dahulu agar file yang salah format gagal sebelum seluruh sheet dibaca
+        header = pd.read_excel(uploaded_file, nrows=0)
+        missing = [col for col in REQUIRED_COLUMNS if col not in header.columns]
+        if missing:
+            st.error(f"Format file tidak sesuai. Kolom wajib tidak ditemukan: {', '.join(missing)}")
+            return pd.DataFrame(), pd.DataFrame(columns=REPORT_COLUMNS)
+        missing_optional = [col for col in REALISASI_SCHEMA if col not in header.columns and col not in REQUIRED_COLUMNS]
+        if missing_optional:
+            st.info(f"Kolom berikut tidak ada dalam file dan tidak ditampilkan: {', '.join(missing_optional)}")
+        if hasattr(uploaded_file, 'seek'):
+            uploaded_file.seek(0)
+
+        df, report = validate_realisasi(pd.read_excel(uploaded_file))
+
+        skala = {}
+        for column in ['investasi_rp_juta', 'investasi_us_ribu']:
+            if column in df.columns:
+                df[column], skala[column] = compact_money(df[column])
         if 'tki' in df.columns:
-            df['tki'] = pd.to_numeric(df['tki'], errors='coerce').fillna(0)
+            # Jumlah tenaga kerja adalah hitungan orang: turunkan ke integer terkecil
+            df['tki'] = pd.to_numeric(df['tki'], downcast='integer')
+        df.attrs['skala'] = skala
 
-        return df
+        return df, report
     except Exception as e:
         st.error(f"Error loading data: {e}")
-        return pd.DataFrame()
+        return pd.DataFrame(), pd.DataFrame(columns=REPORT_COLUMNS)
 
 # Halaman input
 def input_page():
@@ -143,6 +342,24 @@ def create_comparison_card(title, value1, value2, prov1, prov2, unit=""):
     </div>
     """, unsafe_allow_html=True)
 
+# Laporan baris yang ditolak saat validasi, beserta tombol unduh
+def show_rejection_report(report):
+    if report.empty:
+        return
+    rejected_rows = report['baris'].nunique()
+    with st.expander(f"⚠️ Laporan Validasi Data ({rejected_rows} baris ditolak)", expanded=False):
+        st.dataframe(
+            report,
+            use_container_width=True,
+            hide_index=True
+        )
+        st.download_button(
+            label="📥 Unduh Laporan Validasi sebagai CSV",
+            data=report.to_csv(index=False).encode('utf-8'),
+            file_name="laporan_validasi_data.csv",
+            mime="text/csv"
+        )
+
 # Halaman analisis
 def analysis_page():
     if st.button("⬅️ Kembali ke Halaman Input"):
@@ -153,7 +370,11 @@ def analysis_page():
         st.warning("Silakan unggah file terlebih dahulu")
         return
 
-    df = load_data(st.session_state['uploaded_file'])
+    df, rejection_report = load_data(st.session_state['uploaded_file'])
+    if df.empty:
+        st.warning("Data tidak dapat diproses. Periksa kembali file yang diunggah.")
+        show_rejection_report(rejection_report)
+        return
 
     # Sidebar filter
     st.sidebar.image(logo_path, use_container_width=True)
@@ -251,6 +472,17 @@ def analysis_page():
 
     filtered_df = df[pd.concat(filter_conditions, axis=1).all(axis=1)]
 
+    # Kunci status filter untuk cache rincian bertingkat
+    uploaded_file = st.session_state['uploaded_file']
+    filter_key = (
+        getattr(uploaded_file, 'file_id', str(uploaded_file)),
+        tuple(selected_provinces),
+        tuple(selected_kab),
+        tuple(selected_status),
+        tuple(selected_sectors),
+        tuple(selected_countries) if selected_countries is not None else None
+    )
+
     # Header
     st.markdown("<h1 class='header-style'>Dashboard Investasi Indonesia</h1>", unsafe_allow_html=True)
     st.markdown("""
@@ -260,10 +492,12 @@ def analysis_page():
         </div>
     """, unsafe_allow_html=True)
 
+    show_rejection_report(rejection_report)
+
     # Metrics
-    total_rp = filtered_df['investasi_rp_juta'].sum() * 1_000_000 if 'investasi_rp_juta' in filtered_df.columns else 0
-    total_usd = filtered_df['investasi_us_ribu'].sum() * 1_000 if 'investasi_us_ribu' in filtered_df.columns else 0
-    total_tki = filtered_df['tki'].sum() if 'tki' in filtered_df.columns else 0
+    total_rp = scaled_sum(filtered_df, 'investasi_rp_juta', 1_000_000)
+    total_usd = scaled_sum(filtered_df, 'investasi_us_ribu', 1_000)
+    total_tki = scaled_sum(filtered_df, 'tki')
     count_projects = len(filtered_df)
 
     col1, col2, col3 = st.columns(3)
@@ -324,13 +558,14 @@ def analysis_page():
 
     # Visualisasi
     st.markdown("---")
-    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
+    tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
         "📌 Distribusi Proyek", 
         "💰 Nilai Investasi", 
         "🌍 Investasi per Negara",
         "🧭 Komposisi", 
         "📋 Detail Data",
-        "🆚 Perbandingan Provinsi"
+        "🆚 Perbandingan Provinsi",
+        "🔎 Rincian Bertingkat"
     ])
 
     with tab1:
@@ -366,8 +601,8 @@ def analysis_page():
         with col1:
             st.markdown("### 💰 Investasi dalam Rupiah (IDR)")
             if 'investasi_rp_juta' in filtered_df.columns:
-                rp_investment = filtered_df.groupby('provinsi', as_index=False)['investasi_rp_juta'].sum()
-                rp_investment['total_investasi_rp'] = rp_investment['investasi_rp_juta'] * 1_000_000
+                rp_investment = group_sum(filtered_df, filtered_df.groupby('provinsi', as_index=False), 'investasi_rp_juta')
+                rp_investment['total_investasi_rp'] = to_unit(filtered_df, rp_investment['investasi_rp_juta'], 1_000_000)
                 rp_investment = rp_investment.sort_values('total_investasi_rp', ascending=False)
                 
                 fig2a = px.bar(
@@ -396,8 +631,8 @@ def analysis_page():
         with col2:
             st.markdown("### 💵 Investasi dalam Dolar (USD)")
             if 'investasi_us_ribu' in filtered_df.columns:
-                usd_investment = filtered_df.groupby('provinsi', as_index=False)['investasi_us_ribu'].sum()
-                usd_investment['total_investasi_usd'] = usd_investment['investasi_us_ribu'] * 1_000
+                usd_investment = group_sum(filtered_df, filtered_df.groupby('provinsi', as_index=False), 'investasi_us_ribu')
+                usd_investment['total_investasi_usd'] = to_unit(filtered_df, usd_investment['investasi_us_ribu'], 1_000)
                 usd_investment = usd_investment.sort_values('total_investasi_usd', ascending=False)
                 
                 fig2b = px.bar(
@@ -427,8 +662,8 @@ def analysis_page():
         if 'negara' in filtered_df.columns and 'investasi_us_ribu' in filtered_df.columns:
             st.markdown("### 🌍 Investasi per Negara Asal")
             
-            country_investment = filtered_df.groupby(['provinsi', 'negara'], as_index=False)['investasi_us_ribu'].sum()
-            country_investment['total_investasi_usd'] = country_investment['investasi_us_ribu'] * 1_000
+            country_investment = group_sum(filtered_df, filtered_df.groupby(['provinsi', 'negara'], as_index=False), 'investasi_us_ribu')
+            country_investment['total_investasi_usd'] = to_unit(filtered_df, country_investment['investasi_us_ribu'], 1_000)
             country_investment = country_investment.sort_values('total_investasi_usd', ascending=False)
             
             fig3 = px.bar(
@@ -521,13 +756,21 @@ def analysis_page():
                     'investasi_rp_juta', 'investasi_us_ribu', 'tki'] if all(col in filtered_df.columns for col in ['provinsi', 'kabupaten_kota', 'nama_sektor', 'status_penanaman_modal', 'investasi_rp_juta', 'investasi_us_ribu', 'tki']) else available_columns[:5]
         )
         
-        display_df = filtered_df[show_cols].copy()
-        if 'investasi_rp_juta' in show_cols and 'investasi_rp_juta' in display_df.columns:
-            display_df['investasi_rp_juta'] = display_df['investasi_rp_juta'].apply(lambda x: f"Rp {format_number(x)} Juta")
-        if 'investasi_us_ribu' in show_cols and 'investasi_us_ribu' in display_df.columns:
-            display_df['investasi_us_ribu'] = display_df['investasi_us_ribu'].apply(lambda x: f"US$ {format_number(x)} Ribu")
-        if 'tki' in show_cols and 'tki' in display_df.columns:
-            display_df['tki'] = display_df['tki'].apply(lambda x: f"{format_number(x)} orang")
+        # Kolom fixed-point dikembalikan ke satuan asli hanya untuk kolom yang ditampilkan
+        export_df = filtered_df[show_cols]
+        export_df = export_df.assign(**{
+            col: to_unit(filtered_df, export_df[col])
+            for col in show_cols if column_scale(filtered_df, col)
+        })
+        display_formats = {
+            'investasi_rp_juta': lambda x: f"Rp {format_number(x)} Juta",
+            'investasi_us_ribu': lambda x: f"US$ {format_number(x)} Ribu",
+            'tki': lambda x: f"{format_number(x)} orang"
+        }
+        display_df = export_df.assign(**{
+            col: export_df[col].map(fmt)
+            for col, fmt in display_formats.items() if col in show_cols
+        })
         
         st.dataframe(
             display_df,
@@ -536,7 +779,7 @@ def analysis_page():
             hide_index=True
         )
         
-        csv = filtered_df[show_cols].to_csv(index=False).encode('utf-8')
+        csv = export_df.to_csv(index=False).encode('utf-8')
         st.download_button(
             label="📥 Unduh Data sebagai CSV",
             data=csv,
@@ -579,8 +822,8 @@ def analysis_page():
             
             # 2. Perbandingan total investasi USD
             if 'investasi_us_ribu' in filtered_df.columns:
-                invest_prov1 = df_prov1['investasi_us_ribu'].sum() * 1000
-                invest_prov2 = df_prov2['investasi_us_ribu'].sum() * 1000
+                invest_prov1 = scaled_sum(df_prov1, 'investasi_us_ribu', 1000)
+                invest_prov2 = scaled_sum(df_prov2, 'investasi_us_ribu', 1000)
                 create_comparison_card(
                     "Total Investasi (USD)", 
                     invest_prov1, 
@@ -615,10 +858,10 @@ def analysis_page():
                 
                 # Investasi per sektor (jika data tersedia)
                 if 'investasi_us_ribu' in filtered_df.columns:
-                    sector_invest_prov1 = df_prov1.groupby('nama_sektor')['investasi_us_ribu'].sum().reset_index()
-                    sector_invest_prov1['Investasi (USD)'] = sector_invest_prov1['investasi_us_ribu'] * 1000
-                    sector_invest_prov2 = df_prov2.groupby('nama_sektor')['investasi_us_ribu'].sum().reset_index()
-                    sector_invest_prov2['Investasi (USD)'] = sector_invest_prov2['investasi_us_ribu'] * 1000
+                    sector_invest_prov1 = group_sum(df_prov1, df_prov1.groupby('nama_sektor'), 'investasi_us_ribu').reset_index()
+                    sector_invest_prov1['Investasi (USD)'] = to_unit(filtered_df, sector_invest_prov1['investasi_us_ribu'], 1000)
+                    sector_invest_prov2 = group_sum(df_prov2, df_prov2.groupby('nama_sektor'), 'investasi_us_ribu').reset_index()
+                    sector_invest_prov2['Investasi (USD)'] = to_unit(filtered_df, sector_invest_prov2['investasi_us_ribu'], 1000)
                     
                     fig_invest = px.bar(
                         pd.concat([
@@ -639,8 +882,8 @@ def analysis_page():
             if 'tki' in filtered_df.columns:
                 st.markdown("### 👷 Perbandingan Tenaga Kerja")
                 # Total TKI
-                total_tki_prov1 = df_prov1['tki'].sum()
-                total_tki_prov2 = df_prov2['tki'].sum()
+                total_tki_prov1 = scaled_sum(df_prov1, 'tki')
+                total_tki_prov2 = scaled_sum(df_prov2, 'tki')
                 create_comparison_card(
                     "Total Tenaga Kerja", 
                     total_tki_prov1, 
@@ -652,8 +895,8 @@ def analysis_page():
                 
                 # TKI per sektor
                 if 'nama_sektor' in filtered_df.columns:
-                    tki_sector_prov1 = df_prov1.groupby('nama_sektor')['tki'].sum().reset_index()
-                    tki_sector_prov2 = df_prov2.groupby('nama_sektor')['tki'].sum().reset_index()
+                    tki_sector_prov1 = group_sum(df_prov1, df_prov1.groupby('nama_sektor'), 'tki').reset_index()
+                    tki_sector_prov2 = group_sum(df_prov2, df_prov2.groupby('nama_sektor'), 'tki').reset_index()
                     
                     fig_tki = px.bar(
                         pd.concat([
@@ -694,10 +937,10 @@ def analysis_page():
                 
                 # Jika data investasi tersedia
                 if 'investasi_us_ribu' in filtered_df.columns:
-                    status_invest_prov1 = df_prov1.groupby('status_penanaman_modal')['investasi_us_ribu'].sum().reset_index()
-                    status_invest_prov1['Investasi (USD)'] = status_invest_prov1['investasi_us_ribu'] * 1000
-                    status_invest_prov2 = df_prov2.groupby('status_penanaman_modal')['investasi_us_ribu'].sum().reset_index()
-                    status_invest_prov2['Investasi (USD)'] = status_invest_prov2['investasi_us_ribu'] * 1000
+                    status_invest_prov1 = group_sum(df_prov1, df_prov1.groupby('status_penanaman_modal'), 'investasi_us_ribu').reset_index()
+                    status_invest_prov1['Investasi (USD)'] = to_unit(filtered_df, status_invest_prov1['investasi_us_ribu'], 1000)
+                    status_invest_prov2 = group_sum(df_prov2, df_prov2.groupby('status_penanaman_modal'), 'investasi_us_ribu').reset_index()
+                    status_invest_prov2['Investasi (USD)'] = to_unit(filtered_df, status_invest_prov2['investasi_us_ribu'], 1000)
                     
                     fig_status_invest = px.bar(
                         pd.concat([
@@ -714,6 +957,63 @@ def analysis_page():
                     fig_status_invest.update_layout(yaxis_tickprefix='US$ ', yaxis_tickformat=',.0f')
                     st.plotly_chart(fig_status_invest, use_container_width=True)
 
+    with tab7:
+        st.markdown("### 🔎 Rincian Bertingkat")
+
+        cols = st.columns(2)
+        with cols[0]:
+            hierarchy = st.radio("Hierarki", list(DRILLDOWN_HIERARCHIES), horizontal=True)
+        drilldown_metrics = {'Jumlah Proyek': 'jumlah_proyek'}
+        if 'investasi_us_ribu' in filtered_df.columns:
+            drilldown_metrics['Total Investasi (USD)'] = 'total_investasi_usd'
+        if 'tki' in filtered_df.columns:
+            drilldown_metrics['Total Tenaga Kerja'] = 'total_tki'
+        with cols[1]:
+            drilldown_metric = st.selectbox("Ukuran", list(drilldown_metrics), key="drilldown_metric")
+        metric_column = drilldown_metrics[drilldown_metric]
+
+        levels = DRILLDOWN_HIERARCHIES[hierarchy]
+        missing_levels = [col for col in levels if col not in filtered_df.columns]
+        if missing_levels:
+            st.warning(f"Kolom {', '.join(missing_levels)} tidak tersedia dalam dataset")
+        elif filtered_df.empty:
+            st.warning("Tidak ada data untuk dirinci berdasarkan filter saat ini")
+        else:
+            path = []
+            for depth, level in enumerate(levels):
+                summary, _ = drilldown_node(filtered_df, filter_key, hierarchy, tuple(path))
+                summary = summary.sort_values(metric_column, ascending=False)
+
+                st.markdown(f"#### {' › '.join(path) or 'Semua'} — per {DRILLDOWN_LABELS[level]}")
+                fig_drill = px.bar(
+                    summary.reset_index(),
+                    x=metric_column,
+                    y=level,
+                    orientation='h',
+                    text=metric_column,
+                    labels={metric_column: drilldown_metric, level: DRILLDOWN_LABELS[level]},
+                    color=metric_column,
+                    color_continuous_scale='YlGnBu'
+                )
+                fig_drill.update_traces(texttemplate='%{text:.3s}', textposition='outside')
+                fig_drill.update_layout(
+                    yaxis={'categoryorder': 'total ascending'},
+                    height=max(300, 28 * len(summary))
+                )
+                st.plotly_chart(fig_drill, use_container_width=True)
+
+                if depth == len(levels) - 1:
+                    break
+                next_label = DRILLDOWN_LABELS[levels[depth + 1]]
+                choice = st.selectbox(
+                    f"Rinci {DRILLDOWN_LABELS[level]} ke tingkat {next_label}:",
+                    ["—"] + summary.index.tolist(),
+                    key=f"drilldown_{hierarchy}_{'|'.join(path)}"
+                )
+                if choice == "—":
+                    break
+                path.append(choice)
+
 # Main
 if 'page' not in st.session_state:
     st.session_state['page'] = 'input'